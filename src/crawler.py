@@ -5,24 +5,77 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any
-
+import os
+import ssl
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+import httpx
+import orjson
 import requests
-from bs4 import BeautifulSoup
 from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
 MARKETPLACE_API_URL = "https://www.dedaluslabs.ai/api/marketplace"
 MARKETPLACE_BASE_URL = "https://www.dedaluslabs.ai/marketplace"
 GITHUB_BASE_URL = "https://github.com"
+_MARKETPLACE_PREFIX = MARKETPLACE_BASE_URL + "/"
+_GITHUB_PREFIX = GITHUB_BASE_URL + "/"
 REQUEST_TIMEOUT = 30
-MAX_WORKERS = 5
+USER_AGENT = "DedalusMarketplaceCrawler/1.0"
+MAX_CONCURRENCY = 50
+MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_CACHE_TTL = 60.0
+DEFAULT_PREFETCH_TOP_N = 0
+PARSE_CACHE_SIZE = 1024
+API_SERVER_CACHE_SIZE = 4096
+
+# Shared read-only fallback for missing API fields; never mutate it
+_EMPTY: dict[str, Any] = {}
+# Auth flags in the order they take precedence when several are set
+_AUTH_KINDS = ("api_key", "oauth", "none")
+
+# Tool cards are h4 elements with the text-lg font-semibold pattern. Live pages nest
+# them in a card-content div, so the card-scoped query matches descendants.
+_TOOL_HEADING_SELECTOR = "h4.font-semibold.text-lg"
+_CARD_TOOL_HEADING_SELECTOR = f'[data-slot="card"] {_TOOL_HEADING_SELECTOR}'
+
+# Common section/footer headers that share the tool heading style
+_EXCLUDED_TOOL_NAMES = frozenset(
+    {
+        "Tools",
+        "Resources",
+        "Prompts",
+        "Product",
+        "Company",
+        "Legal",
+        "Documentation",
+        "Support",
+        "Contact",
+        "About",
+        "Blog",
+        "Pricing",
+    }
+)
 
 
-class ToolInfo(BaseModel):
+# A slotted dataclass rather than a model since pages can list many tools; Pydantic
+# still validates, serializes and documents it as a field of ServerInfo. Frozen
+# because the parse and detail caches share the same instances across scans.
+@dataclass(slots=True, frozen=True)
+class ToolInfo:
     """Information about a single MCP tool."""
 
     name: str
@@ -53,60 +106,219 @@ class ScanResult(BaseModel):
     errors: list[str] = []
 
 
+class _DetailPage(NamedTuple):
+    """A fetched detail page; html is None when the server answered 304 Not Modified."""
+
+    html: str | None
+    etag: str | None
+    last_modified: str | None
+
+
+class _CachedTools(NamedTuple):
+    """Parsed tools for a detail page URL with the validators needed to revalidate them."""
+
+    etag: str | None
+    last_modified: str | None
+    tools: list[ToolInfo]
+    fetched_at: float
+
+
+def _env_number(name: str, default: float) -> float:
+    """Read a numeric setting from the environment, falling back to default if unset or invalid.
+
+    Settings are read on use rather than at import, so values loaded from a .env
+    file after this module is imported still apply.
+    """
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r, using %s", name, value, default)
+        return default
+
+
+def _cache_ttl() -> float:
+    """Return how long scan results and detail pages stay fresh, in seconds."""
+    return _env_number("MARKETPLACE_CACHE_TTL", DEFAULT_CACHE_TTL)
+
+
+def _prefetch_top_n() -> int:
+    """Return how many of the most popular detail pages a scan without tools prefetches."""
+    return int(_env_number("PREFETCH_TOP_N", DEFAULT_PREFETCH_TOP_N))
+
+
+# Last successful scan per session and include_tools flag, stamped with time.monotonic().
+# Keyed weakly so a caller's session and its results are dropped together. Only the API
+# listing is per session: detail pages and parsed tools below are shared process-wide.
+_CACHE: weakref.WeakKeyDictionary[requests.Session, dict[bool, tuple[float, ScanResult]]] = weakref.WeakKeyDictionary()
+
+
+def _get_cached_scan(session: requests.Session, include_tools: bool) -> ScanResult | None:
+    """Return a copy of a scan made through session that is still within the cache TTL, if any.
+
+    A fresh include_tools=True scan also answers include_tools=False requests
+    by dropping the tool lists. Callers get copies so they can modify results freely.
+    """
+    entries = _CACHE.get(session)
+    if not entries:
+        return None
+    now = time.monotonic()
+    ttl = _cache_ttl()
+    keys = (True,) if include_tools else (False, True)
+    for key in keys:
+        entry = entries.get(key)
+        if entry is None or now - entry[0] >= ttl:
+            continue
+        result = entry[1]
+        if key == include_tools:
+            return result.model_copy(deep=True)
+        return ScanResult(
+            total_servers=result.total_servers,
+            servers=[server.model_copy(update={"tools": []}) for server in result.servers],
+            errors=list(result.errors),
+        )
+    return None
+
+
+def _store_cached_scan(session: requests.Session, include_tools: bool, result: ScanResult) -> None:
+    """Cache a copy of a scan result, or invalidate the entry if the scan had errors."""
+    entries = _CACHE.setdefault(session, {})
+    if result.errors:
+        entries.pop(include_tools, None)
+    else:
+        entries[include_tools] = (time.monotonic(), result.model_copy(deep=True))
+
+
+# Process-wide session so repeated scans reuse pooled keep-alive connections
+_SHARED_SESSION: requests.Session | None = None
+_SHARED_SESSION_LOCK = threading.Lock()
+
+
+def _get_shared_session() -> requests.Session:
+    """Return the shared requests session, creating it on first use."""
+    global _SHARED_SESSION
+    with _SHARED_SESSION_LOCK:
+        if _SHARED_SESSION is None:
+            session = requests.Session()
+            retries = Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504))
+            adapter = HTTPAdapter(max_retries=retries)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"User-Agent": USER_AGENT, "Accept": "application/json"})
+            _SHARED_SESSION = session
+        return _SHARED_SESSION
+
+
 def _fetch_api_data(session: requests.Session) -> dict[str, Any]:
     """Fetch data from the marketplace API."""
     response = session.get(MARKETPLACE_API_URL, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
-    return response.json()
+    return orjson.loads(response.content)
 
 
 def _parse_api_server(repo: dict[str, Any]) -> ServerInfo:
-    """Parse a server entry from the API response."""
-    slug = repo.get("slug", "")
-    parts = slug.split("/", 1)
-    publisher = parts[0] if len(parts) > 0 else "unknown"
-    name = parts[1] if len(parts) > 1 else slug
+    """Parse a server entry from the API response.
+
+    Rows rarely change between scans, so parsing is memoized on the fields it reads.
+    Each call returns a fresh copy because enrichment assigns tools on the result.
+    """
+    tags_json = orjson.dumps(repo.get("tags") or _EMPTY, option=orjson.OPT_SORT_KEYS)
+    server = _parse_api_server_cached(
+        repo.get("slug", ""),
+        repo.get("git_slug"),
+        repo.get("description"),
+        repo.get("subtitle"),
+        repo.get("heat_score"),
+        repo.get("upvote_count"),
+        tags_json,
+    )
+    return server.model_copy(update={"tools": []})
+
+
+@lru_cache(maxsize=API_SERVER_CACHE_SIZE)
+def _parse_api_server_cached(
+    slug: str,
+    git_slug: str | None,
+    description: str | None,
+    subtitle: str | None,
+    heat_score: int | None,
+    upvote_count: int | None,
+    tags_json: bytes,
+) -> ServerInfo:
+    """Build a ServerInfo from the hashable fields of an API row."""
+    publisher, sep, name = slug.partition("/")
+    if not sep:
+        name = slug
 
     # Build GitHub URL from git_slug
-    git_slug = repo.get("git_slug")
-    github_url = f"{GITHUB_BASE_URL}/{git_slug}" if git_slug else None
+    github_url = _GITHUB_PREFIX + git_slug if git_slug else None
 
     # Extract auth type from tags (handle None explicitly)
-    tags = repo.get("tags") or {}
-    auth_info = tags.get("auth") or {}
+    tags = orjson.loads(tags_json)
+    auth_info = (tags.get("auth") if tags else None) or _EMPTY
     auth_required = None
-    if auth_info.get("api_key"):
-        auth_required = "api_key"
-    elif auth_info.get("oauth"):
-        auth_required = "oauth"
-    elif auth_info.get("none"):
-        auth_required = "none"
-
-    return ServerInfo(
+    for kind in _AUTH_KINDS:
+        if auth_info.get(kind):
+            auth_required = kind
+            break
+
+    # The API payload is trusted and already typed, so skip Pydantic validation
+    return ServerInfo.model_construct(
         name=name,
         slug=slug,
         publisher=publisher,
-        description=repo.get("description") or repo.get("subtitle"),
+        description=description or subtitle,
         github_url=github_url,
-        marketplace_url=f"{MARKETPLACE_BASE_URL}/{slug}",
+        marketplace_url=_MARKETPLACE_PREFIX + slug,
         language=tags.get("language"),
-        heat_score=repo.get("heat_score"),
-        upvote_count=repo.get("upvote_count"),
+        heat_score=heat_score,
+        upvote_count=upvote_count,
+        tools=[],
         auth_required=auth_required,
     )
 
 
-def _fetch_detail_page(session: requests.Session, url: str) -> str | None:
-    """Fetch a detail page HTML."""
+# Parsed tool lists keyed by a digest of the detail page HTML
+_PARSE_CACHE: dict[str, list[ToolInfo]] = {}
+_PARSE_CACHE_LOCK = threading.Lock()
+
+# Last successfully parsed detail page per URL, shared by every session. Entries younger
+# than the cache TTL are reused as-is; older ones are revalidated with a conditional request.
+_DETAIL_CACHE: dict[str, _CachedTools] = {}
+
+
+async def _fetch_detail_page(
+    client: httpx.AsyncClient, url: str, etag: str | None = None, last_modified: str | None = None
+) -> _DetailPage | None:
+    """Fetch a detail page HTML, revalidating with the given validators if any."""
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
     try:
-        response = session.get(url, timeout=REQUEST_TIMEOUT)
+        response = await client.get(url, headers=headers)
+        if response.status_code == 304:
+            return _DetailPage(None, etag, last_modified)
         response.raise_for_status()
-        return response.text
-    except requests.RequestException as e:
+        return _DetailPage(response.text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    except httpx.HTTPError as e:
         logger.warning("Failed to fetch %s: %s", url, e)
         return None
 
 
+def _next_element(node: LexborNode) -> LexborNode | None:
+    """Return the next sibling element, skipping whitespace text and comment nodes."""
+    sibling = node.next
+    # Lexbor names non-element nodes "-text", "-comment", etc.; checking the tag
+    # works on every supported selectolax, unlike is_element_node (added in 1.0)
+    while sibling is not None and sibling.tag.startswith("-"):
+        sibling = sibling.next
+    return sibling
+
+
 def _parse_tools_from_html(html: str) -> list[ToolInfo]:
     """Parse tool information from a detail page HTML.
 
@@ -114,111 +326,329 @@ def _parse_tools_from_html(html: str) -> list[ToolInfo]:
     so this function may not find tools from live page fetches. It works with
     server-side rendered or browser-saved HTML that includes the tool content.
     """
-    soup = BeautifulSoup(html, "lxml")
-    tools = []
+    # Pages without the tool heading classes cannot contain tools; skip building a tree
+    if "font-semibold" not in html or "text-lg" not in html:
+        return []
 
-    # Common section/footer headers to exclude
-    excluded_names = {
-        "Tools",
-        "Resources",
-        "Prompts",
-        "Product",
-        "Company",
-        "Legal",
-        "Documentation",
-        "Support",
-        "Contact",
-        "About",
-        "Blog",
-        "Pricing",
-    }
-
-    # Find tool cards - specifically look for h4 elements within card components
-    # that have the right structure (text-lg font-semibold pattern)
-    tool_cards = soup.find_all("h4", class_=lambda c: c and "font-semibold" in c and "text-lg" in c)
+    tree = LexborHTMLParser(html)
+    tools = []
 
-    for h4 in tool_cards:
-        tool_name = h4.get_text(strip=True)
+    # Prefer headings inside tool cards so footer and section headers are never visited;
+    # fall back to a page-wide query for markup without card wrappers
+    headings = tree.css(_CARD_TOOL_HEADING_SELECTOR) or tree.css(_TOOL_HEADING_SELECTOR)
 
-        # Skip if it looks like a section header, not a tool name
-        if not tool_name or tool_name in excluded_names:
-            continue
+    for h4 in headings:
+        tool_name = h4.text(strip=True)
 
-        # Skip if it's all uppercase (likely a section header)
-        if tool_name.isupper():
+        # Skip empty headings, known section headers, and all-uppercase headers
+        if not tool_name or tool_name in _EXCLUDED_TOOL_NAMES or tool_name.isupper():
             continue
 
-        # Find the description paragraph sibling
+        # The description is the paragraph directly after the heading, if any
         description = None
-        next_p = h4.find_next_sibling("p")
-        if next_p:
-            description = next_p.get_text(strip=True)
+        sibling = _next_element(h4)
+        if sibling is not None and sibling.tag == "p":
+            description = sibling.text(strip=True)
 
         tools.append(ToolInfo(name=tool_name, description=description))
 
     return tools
 
 
-def _enrich_with_tools(
-    session: requests.Session, servers: list[ServerInfo], max_workers: int = MAX_WORKERS
+def _html_digest(html: str) -> str:
+    """Return the parse cache key for a detail page."""
+    return hashlib.blake2b(html.encode(), digest_size=16).hexdigest()
+
+
+def _store_parsed_tools(key: str, tools: list[ToolInfo]) -> None:
+    """Add a parsed tool list to the parse cache, evicting the oldest entry when full."""
+    with _PARSE_CACHE_LOCK:
+        if len(_PARSE_CACHE) >= PARSE_CACHE_SIZE:
+            # Dicts preserve insertion order, so the first key is the oldest
+            del _PARSE_CACHE[next(iter(_PARSE_CACHE))]
+        _PARSE_CACHE[key] = tools
+
+
+def _parse_pages(pages: list[str]) -> list[list[ToolInfo]]:
+    """Parse a batch of detail pages in order.
+
+    Pages parse in well under a millisecond each, so a process pool costs far more in
+    startup and pickling than it saves at marketplace sizes.
+    """
+    return [_parse_tools_from_html(html) for html in pages]
+
+
+async def _enrich_with_tools_async(
+    servers: list[ServerInfo], max_concurrency: int = MAX_CONCURRENCY, client_options: dict[str, Any] | None = None
 ) -> list[str]:
-    """Enrich servers with tool information by scraping detail pages."""
-    errors = []
+    """Enrich servers with tool information by scraping detail pages.
 
-    def fetch_tools(server: ServerInfo) -> tuple[ServerInfo, list[ToolInfo] | None, str | None]:
+    Pages are fetched concurrently first, then every page not already in the
+    parse cache is parsed in a single batch. client_options are extra
+    httpx.AsyncClient arguments, usually from _detail_client_options.
+    """
+    errors = []
+    semaphore = asyncio.Semaphore(max_concurrency)
+    ttl = _cache_ttl()
+
+    # HTTP/2 multiplexes the detail page requests over a single connection per host
+    limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS)
+
+    async with httpx.AsyncClient(
+        http2=True, timeout=REQUEST_TIMEOUT, limits=limits, follow_redirects=True, **(client_options or {})
+    ) as client:
+
+        async def fetch_page(server: ServerInfo) -> _DetailPage | None:
+            url = server.marketplace_url
+            cached = _DETAIL_CACHE.get(url)
+            if cached is None:
+                async with semaphore:
+                    return await _fetch_detail_page(client, url)
+            if time.monotonic() - cached.fetched_at < ttl:
+                # Fetched recently (possibly by a prefetch), reuse without a request
+                return _DetailPage(None, cached.etag, cached.last_modified)
+            async with semaphore:
+                page = await _fetch_detail_page(client, url, cached.etag, cached.last_modified)
+            if page is not None and page.html is None:
+                _DETAIL_CACHE[url] = cached._replace(fetched_at=time.monotonic())
+            return page
+
+        pages = await asyncio.gather(*(fetch_page(server) for server in servers), return_exceptions=True)
+
+    # Resolve tools from the caches where possible and collect the pages left to parse
+    pending: list[tuple[ServerInfo, str, str | None, str | None]] = []
+    tools_by_key: dict[str, list[ToolInfo]] = {}
+    unparsed: dict[str, str] = {}
+    for server, page in zip(servers, pages, strict=True):
+        error = None
+        if page is None:
+            error = f"Failed to fetch {server.marketplace_url}"
+        elif isinstance(page, BaseException):
+            error = f"Error processing {server.slug}: {page}"
+        elif page.html is None:
+            # Still fresh or 304 Not Modified: reuse the tools parsed from the cached page
+            cached = _DETAIL_CACHE.get(server.marketplace_url)
+            if cached is None:
+                error = f"Failed to fetch {server.marketplace_url}"
+            else:
+                server.tools = list(cached.tools)
+        else:
+            key = _html_digest(page.html)
+            pending.append((server, key, page.etag, page.last_modified))
+            tools = _PARSE_CACHE.get(key)
+            if tools is not None:
+                tools_by_key[key] = tools
+            else:
+                unparsed[key] = page.html
+        if error:
+            errors.append(error)
+            logger.warning(error)
+
+    # Release bodies that were answered from the parse cache before the batch parse
+    del pages
+
+    # Parse the remaining pages off the event loop in one batch
+    parse_error: Exception | None = None
+    if unparsed:
         try:
-            html = _fetch_detail_page(session, server.marketplace_url)
-            if html:
-                tools = _parse_tools_from_html(html)
-                return (server, tools, None)
-            return (server, None, f"Failed to fetch {server.marketplace_url}")
+            parsed = await asyncio.to_thread(_parse_pages, list(unparsed.values()))
         except Exception as e:
-            return (server, None, f"Error processing {server.slug}: {e}")
+            parse_error = e
+        else:
+            for key, tools in zip(unparsed, parsed, strict=True):
+                _store_parsed_tools(key, tools)
+                tools_by_key[key] = tools
+
+    for server, key, etag, last_modified in pending:
+        tools = tools_by_key.get(key)
+        if tools is None:
+            # Only reachable when the parse batch failed
+            error = f"Error processing {server.slug}: {parse_error}"
+            errors.append(error)
+            logger.warning(error)
+            continue
+        server.tools = list(tools)
+        _DETAIL_CACHE[server.marketplace_url] = _CachedTools(etag, last_modified, tools, time.monotonic())
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(fetch_tools, server): server for server in servers}
+    return errors
 
-        for future in as_completed(futures):
-            server, tools, error = future.result()
-            if error:
-                errors.append(error)
-                logger.warning(error)
-            elif tools is not None:
-                server.tools = tools
 
-    return errors
+def _enrich_with_tools(
+    session: requests.Session, servers: list[ServerInfo], max_concurrency: int = MAX_CONCURRENCY
+) -> list[str]:
+    """Enrich servers with tool information, fetching detail pages with the session's settings.
+
+    Safe to call from async code: asyncio.run cannot start inside a running loop,
+    so in that case the fetches run on a one-off worker thread while the caller blocks.
+    """
+    options = _detail_client_options(session)
+
+    def run() -> list[str]:
+        return asyncio.run(_enrich_with_tools_async(servers, max_concurrency=max_concurrency, client_options=options))
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return run()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="marketplace-enrich") as executor:
+        return executor.submit(run).result()
+
+
+def _detail_client_options(session: requests.Session) -> dict[str, Any]:
+    """Map the API session's transport settings onto httpx.AsyncClient arguments for detail pages.
+
+    Carries over the User-Agent, cookies, proxies, TLS verification, client
+    certificate and trust_env. Session auth and mounted adapters have no httpx
+    equivalent and apply to the API request only.
+    """
+    options: dict[str, Any] = {"trust_env": session.trust_env, "cookies": session.cookies}
+    user_agent = session.headers.get("User-Agent")
+    if user_agent:
+        options["headers"] = {"User-Agent": user_agent}
+    proxy = session.proxies.get("https") or session.proxies.get("all")
+    if proxy:
+        options["proxy"] = proxy
+    if session.verify is not True or session.cert:
+        options["verify"] = _detail_ssl_context(session.verify, session.cert)
+    return options
+
+
+def _detail_ssl_context(verify: bool | str, cert: str | tuple[str, str] | None) -> ssl.SSLContext:
+    """Build an SSL context equivalent to a requests session's verify and cert settings."""
+    if isinstance(verify, str):
+        if os.path.isdir(verify):
+            context = ssl.create_default_context(capath=verify)
+        else:
+            context = ssl.create_default_context(cafile=verify)
+    else:
+        context = httpx.create_ssl_context(verify=verify)
+    if cert:
+        certfile, keyfile = (cert, None) if isinstance(cert, str) else cert
+        context.load_cert_chain(certfile, keyfile)
+    return context
+
+
+def _prefetch_detail_pages(servers: list[ServerInfo], client_options: dict[str, Any]) -> None:
+    """Fetch and parse detail pages into the caches without touching the given servers."""
+    copies = [server.model_copy(update={"tools": []}) for server in servers]
+    try:
+        asyncio.run(_enrich_with_tools_async(copies, client_options=client_options))
+    except Exception as e:
+        logger.warning("Detail page prefetch failed: %s", e)
+
+
+def _start_prefetch(session: requests.Session, servers: list[ServerInfo]) -> threading.Thread:
+    """Warm the detail page caches for the PREFETCH_TOP_N most popular servers in the background."""
+    popular = sorted(servers, key=lambda s: s.heat_score or 0, reverse=True)[: _prefetch_top_n()]
+    thread = threading.Thread(
+        target=_prefetch_detail_pages,
+        args=(popular, _detail_client_options(session)),
+        name="marketplace-prefetch",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def _load_servers(session: requests.Session) -> tuple[list[ServerInfo], str | None]:
+    """Fetch the API listing and parse it, returning the servers or an error message."""
+    try:
+        data = _fetch_api_data(session)
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
+        return [], f"Failed to fetch marketplace API: {e}"
+
+    repositories = data.get("repositories", [])
+    return [_parse_api_server(repo) for repo in repositories], None
+
+
+def _finish_scan(
+    session: requests.Session, include_tools: bool, servers: list[ServerInfo], errors: list[str]
+) -> ScanResult:
+    """Build the scan result and record it in the result cache."""
+    result = ScanResult(total_servers=len(servers), servers=servers, errors=errors)
+    _store_cached_scan(session, include_tools, result)
+    return result
 
 
 def scan_marketplace_sync(include_tools: bool = False, session: requests.Session | None = None) -> ScanResult:
     """
     Scan the Dedalus Marketplace and return information about all servers.
 
+    Results are cached in-process for MARKETPLACE_CACHE_TTL seconds (environment
+    variable, default 60) per session, so repeated calls skip the API and detail
+    page fetches. Each call returns its own copy of the result. Detail pages are
+    public and cached process-wide, so a tools scan through one session may
+    reuse tool lists fetched through another.
+
     Args:
         include_tools: If True, fetch detail pages to extract tool information.
                       This makes the operation slower but provides complete data.
-        session: Optional requests session for connection pooling.
+        session: Optional requests session. Defaults to a shared session that
+                 keeps connections alive across scans. Detail pages are fetched
+                 with httpx, which reuses the session's User-Agent, cookies,
+                 proxies, verify, cert and trust_env settings but not its auth
+                 or mounted adapters.
 
     Returns:
         ScanResult containing all server information and any errors encountered.
     """
     if session is None:
-        session = requests.Session()
-        session.headers.update({"User-Agent": "DedalusMarketplaceCrawler/1.0", "Accept": "application/json"})
+        session = _get_shared_session()
 
-    errors: list[str] = []
+    cached = _get_cached_scan(session, include_tools)
+    if cached is not None:
+        return cached
 
-    # Fetch from API
-    try:
-        data = _fetch_api_data(session)
-    except requests.RequestException as e:
-        return ScanResult(total_servers=0, servers=[], errors=[f"Failed to fetch marketplace API: {e}"])
+    servers, api_error = _load_servers(session)
+    if api_error:
+        return _finish_scan(session, include_tools, [], [api_error])
 
-    repositories = data.get("repositories", [])
-    servers = [_parse_api_server(repo) for repo in repositories]
+    errors: list[str] = []
 
     # Optionally enrich with tools from detail pages
     if include_tools and servers:
         tool_errors = _enrich_with_tools(session, servers)
         errors.extend(tool_errors)
+    elif servers and _prefetch_top_n() > 0:
+        # A tools scan often follows; fetch the hottest detail pages while the caller works
+        _start_prefetch(session, servers)
+
+    return _finish_scan(session, include_tools, servers, errors)
+
+
+async def scan_marketplace_async(include_tools: bool = False, session: requests.Session | None = None) -> ScanResult:
+    """
+    Scan the Dedalus Marketplace without blocking the running event loop.
+
+    Behaves like scan_marketplace_sync, but the API request runs in a worker
+    thread and detail pages are fetched on the caller's loop.
+
+    Args:
+        include_tools: If True, fetch detail pages to extract tool information.
+        session: Optional requests session for the API request. Defaults to the
+                 shared session. Detail pages reuse its settings as described
+                 for scan_marketplace_sync.
+
+    Returns:
+        ScanResult containing all server information and any errors encountered.
+    """
+    if session is None:
+        session = _get_shared_session()
+
+    cached = _get_cached_scan(session, include_tools)
+    if cached is not None:
+        return cached
+
+    servers, api_error = await asyncio.to_thread(_load_servers, session)
+    if api_error:
+        return _finish_scan(session, include_tools, [], [api_error])
+
+    errors: list[str] = []
+
+    if include_tools and servers:
+        tool_errors = await _enrich_with_tools_async(servers, client_options=_detail_client_options(session))
+        errors.extend(tool_errors)
+    elif servers and _prefetch_top_n() > 0:
+        _start_prefetch(session, servers)
 
-    return ScanResult(total_servers=len(servers), servers=servers, errors=errors)
+    return _finish_scan(session, include_tools, servers, errors)
@@ -6,7 +6,7 @@
 from dedalus_mcp import MCPServer, tool
 from dedalus_mcp.server import TransportSecuritySettings
 
-from crawler import ScanResult, scan_marketplace_sync
+from crawler import ScanResult, scan_marketplace_async
 
 
 @tool(
@@ -42,7 +42,7 @@ async def scan_marketplace(include_tools: bool = False) -> ScanResult:
           - auth_required: Authentication type required (api_key/oauth/none)
         - errors: List of any errors encountered during scanning
     """
-    return scan_marketplace_sync(include_tools=include_tools)
+    return await scan_marketplace_async(include_tools=include_tools)
 
 
 server = MCPServer(
@@ -5,6 +5,7 @@
 
 import pytest
 import requests
+import requests_mock
 
 
 @pytest.fixture
@@ -115,3 +116,12 @@ def requests_session() -> requests.Session:
     session = requests.Session()
     session.headers.update({"User-Agent": "TestCrawler/1.0", "Accept": "application/json"})
     return session
+
+
+@pytest.fixture
+def api_mock(requests_session: requests.Session) -> requests_mock.Adapter:
+    """Mount a requests-mock transport adapter on the test session."""
+    adapter = requests_mock.Adapter()
+    requests_session.mount("https://", adapter)
+    requests_session.mount("http://", adapter)
+    return adapter
@@ -3,15 +3,20 @@
 
 """Tests for the marketplace crawler."""
 
-import sys
+import asyncio
+import dataclasses
+import ssl
+from collections.abc import Iterator
 from pathlib import Path
 
+import httpx
+import pytest
 import requests
-import requests_mock as rm
-
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import requests_mock
+import respx
+from pytest_mock import MockerFixture
 
+import crawler
 from crawler import (
     MARKETPLACE_API_URL,
     MARKETPLACE_BASE_URL,
@@ -20,9 +25,25 @@ from crawler import (
     ToolInfo,
     _parse_api_server,
     _parse_tools_from_html,
+    scan_marketplace_async,
     scan_marketplace_sync,
 )
 
+EXAMPLES_DIR = Path(__file__).parent.parent / "examples"
+
+
+@pytest.fixture(autouse=True)
+def clear_scan_cache() -> Iterator[None]:
+    """Keep cached scan results and detail pages from leaking between tests."""
+    caches = (crawler._CACHE, crawler._PARSE_CACHE, crawler._DETAIL_CACHE)
+    for cache in caches:
+        cache.clear()
+    crawler._parse_api_server_cached.cache_clear()
+    yield
+    for cache in caches:
+        cache.clear()
+    crawler._parse_api_server_cached.cache_clear()
+
 
 class TestParseApiServer:
     """Tests for _parse_api_server function."""
@@ -50,6 +71,8 @@ class TestParseApiServer:
         assert result.heat_score == 80
         assert result.upvote_count == 15
         assert result.auth_required == "api_key"
+        assert result.tools == []
+        assert ServerInfo.model_validate(result.model_dump()) == result
 
     def test_parse_server_with_subtitle_fallback(self) -> None:
         """Test that subtitle is used when description is missing."""
@@ -97,6 +120,52 @@ class TestParseApiServer:
 
         assert result.auth_required == "none"
 
+    def test_parse_server_auth_precedence(self) -> None:
+        """Test that api_key wins over oauth, and oauth over none, when several flags are set."""
+        both = _parse_api_server({"slug": "pub/srv", "tags": {"auth": {"none": True, "oauth": True, "api_key": True}}})
+        oauth = _parse_api_server({"slug": "pub/other", "tags": {"auth": {"none": True, "oauth": True}}})
+        missing = _parse_api_server({"slug": "pub/bare", "tags": None})
+
+        assert both.auth_required == "api_key"
+        assert oauth.auth_required == "oauth"
+        assert missing.auth_required is None
+
+    def test_parse_server_slug_without_publisher(self) -> None:
+        """Test that a slug without a separator is used as the name."""
+        result = _parse_api_server({"slug": "standalone", "tags": {}})
+
+        assert result.name == "standalone"
+        assert result.publisher == "standalone"
+        assert result.marketplace_url == f"{MARKETPLACE_BASE_URL}/standalone"
+
+    def test_parse_server_reuses_cached_row(self) -> None:
+        """Test that unchanged rows hit the cache but still return independent copies."""
+        repo = {
+            "slug": "pub/srv",
+            "git_slug": "pub/srv",
+            "heat_score": 10,
+            "tags": {"language": "python", "auth": {"oauth": True}},
+        }
+
+        first = _parse_api_server(repo)
+        first.tools = [ToolInfo(name="tool1")]
+        second = _parse_api_server({**repo, "tags": {"auth": {"oauth": True}, "language": "python"}})
+
+        assert crawler._parse_api_server_cached.cache_info().hits == 1
+        assert second is not first
+        assert second.tools == []
+        assert second.auth_required == "oauth"
+
+    def test_parse_server_changed_row_is_reparsed(self) -> None:
+        """Test that a changed field produces a fresh parse."""
+        repo = {"slug": "pub/srv", "git_slug": "pub/srv", "heat_score": 10, "tags": {}}
+
+        _parse_api_server(repo)
+        result = _parse_api_server({**repo, "heat_score": 20})
+
+        assert crawler._parse_api_server_cached.cache_info().misses == 2
+        assert result.heat_score == 20
+
 
 class TestParseToolsFromHtml:
     """Tests for _parse_tools_from_html function."""
@@ -117,6 +186,15 @@ class TestParseToolsFromHtml:
 
         assert len(tools) == 0
 
+    def test_parse_tools_skips_parser_for_tool_less_html(
+        self, mock_detail_page_without_tools: str, mocker: MockerFixture
+    ) -> None:
+        """Test that pages without tool heading classes are not parsed at all."""
+        parser = mocker.patch.object(crawler, "LexborHTMLParser")
+
+        assert _parse_tools_from_html(mock_detail_page_without_tools) == []
+        parser.assert_not_called()
+
     def test_parse_tools_excludes_section_headers(self) -> None:
         """Test that section headers like 'Tools' are excluded from results."""
         html = """
@@ -135,35 +213,103 @@ class TestParseToolsFromHtml:
         assert len(tools) == 1
         assert tools[0].name == "actual_tool"
 
+    def test_parse_tools_description_must_follow_heading(self) -> None:
+        """Test that only a paragraph directly after the heading is used as description."""
+        html = """
+        <html>
+        <body>
+            <div data-slot="card">
+                <h4 class="text-lg font-semibold">bare_tool</h4>
+                <div><span>Parameters</span></div>
+                <p>Footnote</p>
+            </div>
+            <div data-slot="card">
+                <h4 class="text-lg font-semibold">described_tool</h4>
+                <!-- rendered description -->
+                <p>Described</p>
+            </div>
+        </body>
+        </html>
+        """
+
+        tools = _parse_tools_from_html(html)
+
+        assert [(tool.name, tool.description) for tool in tools] == [
+            ("bare_tool", None),
+            ("described_tool", "Described"),
+        ]
+
+    def test_parse_tools_ignores_headings_outside_cards(self) -> None:
+        """Test that only card headings are used when the page has tool cards."""
+        html = """
+        <html>
+        <body>
+            <div data-slot="card">
+                <div data-slot="card-content">
+                    <h4 class="text-lg font-semibold">card_tool</h4>
+                    <p>Card tool description</p>
+                </div>
+            </div>
+            <section>
+                <h4 class="text-lg font-semibold">Changelog</h4>
+                <p>Not a tool</p>
+            </section>
+        </body>
+        </html>
+        """
+
+        tools = _parse_tools_from_html(html)
+
+        assert [(tool.name, tool.description) for tool in tools] == [("card_tool", "Card tool description")]
+
+    def test_parse_tools_from_saved_marketplace_page(self) -> None:
+        """Test parsing a browser-saved marketplace detail page."""
+        html = (EXAMPLES_DIR / "dedaluslabs-ai-marketplace-akakak-sonar.html").read_text(encoding="utf-8")
+
+        tools = _parse_tools_from_html(html)
+
+        assert [tool.name for tool in tools] == ["perplexity_ask", "perplexity_research", "perplexity_reason"]
+        assert tools[0].description.startswith("Engages in a conversation using the Sonar API.")
+
+    def test_parse_pages_keeps_order(
+        self, mock_detail_page_with_tools: str, mock_detail_page_without_tools: str
+    ) -> None:
+        """Test that a batch of pages is parsed into tool lists in input order."""
+        results = crawler._parse_pages([mock_detail_page_with_tools, mock_detail_page_without_tools])
+
+        assert [tool.name for tool in results[0]] == ["test_tool_one", "test_tool_two"]
+        assert results[1] == []
+
 
 class TestScanMarketplaceSync:
     """Tests for scan_marketplace_sync function."""
 
-    def test_scan_without_tools(self, mock_api_response: dict, requests_session: requests.Session) -> None:
+    def test_scan_without_tools(
+        self, mock_api_response: dict, requests_session: requests.Session, api_mock: requests_mock.Adapter
+    ) -> None:
         """Test scanning marketplace without fetching tools."""
-        with rm.Mocker() as m:
-            m.get(MARKETPLACE_API_URL, json=mock_api_response)
+        api_mock.register_uri("GET", MARKETPLACE_API_URL, json=mock_api_response)
 
-            result = scan_marketplace_sync(include_tools=False, session=requests_session)
+        result = scan_marketplace_sync(include_tools=False, session=requests_session)
 
-            assert result.total_servers == 2
-            assert len(result.servers) == 2
-            assert len(result.errors) == 0
+        assert result.total_servers == 2
+        assert len(result.servers) == 2
+        assert len(result.errors) == 0
 
-            # Check first server
-            server1 = result.servers[0]
-            assert server1.name == "test-server"
-            assert server1.publisher == "testpub"
-            assert server1.github_url == "https://github.com/testpub/test-server-repo"
-            assert server1.language == "python"
-            assert server1.auth_required == "api_key"
-            assert server1.tools == []  # No tools fetched
-
-            # Check second server
-            server2 = result.servers[1]
-            assert server2.name == "another-server"
-            assert server2.publisher == "anotherpub"
-            assert server2.auth_required == "none"
+        # Check first server
+        server1 = result.servers[0]
+        assert server1.name == "test-server"
+        assert server1.publisher == "testpub"
+        assert server1.github_url == "https://github.com/testpub/test-server-repo"
+        assert server1.language == "python"
+        assert server1.auth_required == "api_key"
+        assert server1.tools == []  # No tools fetched
+
+        # Check second server
+        server2 = result.servers[1]
+        assert server2.name == "another-server"
+        assert server2.publisher == "anotherpub"
+        assert server2.auth_required == "none"
 
     def test_scan_with_tools(
         self,
@@ -171,12 +317,13 @@ class TestScanMarketplaceSync:
         mock_detail_page_with_tools: str,
         mock_detail_page_without_tools: str,
         requests_session: requests.Session,
+        api_mock: requests_mock.Adapter,
     ) -> None:
         """Test scanning marketplace with tool fetching enabled."""
-        with rm.Mocker() as m:
-            m.get(MARKETPLACE_API_URL, json=mock_api_response)
-            m.get(f"{MARKETPLACE_BASE_URL}/testpub/test-server", text=mock_detail_page_with_tools)
-            m.get(f"{MARKETPLACE_BASE_URL}/anotherpub/another-server", text=mock_detail_page_without_tools)
+        with respx.mock() as rx:
+            api_mock.register_uri("GET", MARKETPLACE_API_URL, json=mock_api_response)
+            rx.get(f"{MARKETPLACE_BASE_URL}/testpub/test-server").respond(text=mock_detail_page_with_tools)
+            rx.get(f"{MARKETPLACE_BASE_URL}/anotherpub/another-server").respond(text=mock_detail_page_without_tools)
 
             result = scan_marketplace_sync(include_tools=True, session=requests_session)
 
@@ -192,27 +339,43 @@ class TestScanMarketplaceSync:
             server2 = result.servers[1]
             assert len(server2.tools) == 0
 
-    def test_scan_handles_api_failure(self, requests_session: requests.Session) -> None:
+    def test_scan_handles_api_failure(
+        self, requests_session: requests.Session, api_mock: requests_mock.Adapter
+    ) -> None:
         """Test that API failure is handled gracefully."""
-        with rm.Mocker() as m:
-            m.get(MARKETPLACE_API_URL, status_code=500)
+        api_mock.register_uri("GET", MARKETPLACE_API_URL, status_code=500)
 
-            result = scan_marketplace_sync(include_tools=False, session=requests_session)
+        result = scan_marketplace_sync(include_tools=False, session=requests_session)
 
-            assert result.total_servers == 0
-            assert len(result.servers) == 0
-            assert len(result.errors) == 1
-            assert "Failed to fetch marketplace API" in result.errors[0]
+        assert result.total_servers == 0
+        assert len(result.servers) == 0
+        assert len(result.errors) == 1
+        assert "Failed to fetch marketplace API" in result.errors[0]
+
+    def test_scan_handles_invalid_json(
+        self, requests_session: requests.Session, api_mock: requests_mock.Adapter
+    ) -> None:
+        """Test that a malformed API payload is reported as an error."""
+        api_mock.register_uri("GET", MARKETPLACE_API_URL, text="<html>maintenance</html>")
+
+        result = scan_marketplace_sync(include_tools=False, session=requests_session)
+
+        assert result.total_servers == 0
+        assert "Failed to fetch marketplace API" in result.errors[0]
 
     def test_scan_handles_detail_page_failure(
-        self, mock_api_response: dict, mock_detail_page_with_tools: str, requests_session: requests.Session
+        self,
+        mock_api_response: dict,
+        mock_detail_page_with_tools: str,
+        requests_session: requests.Session,
+        api_mock: requests_mock.Adapter,
     ) -> None:
         """Test that detail page failures don't crash the entire scan."""
-        with rm.Mocker() as m:
-            m.get(MARKETPLACE_API_URL, json=mock_api_response)
-            m.get(f"{MARKETPLACE_BASE_URL}/testpub/test-server", text=mock_detail_page_with_tools)
+        with respx.mock() as rx:
+            api_mock.register_uri("GET", MARKETPLACE_API_URL, json=mock_api_response)
+            rx.get(f"{MARKETPLACE_BASE_URL}/testpub/test-server").respond(text=mock_detail_page_with_tools)
             # Second detail page fails
-            m.get(f"{MARKETPLACE_BASE_URL}/anotherpub/another-server", status_code=404)
+            rx.get(f"{MARKETPLACE_BASE_URL}/anotherpub/another-server").respond(404)
 
             result = scan_marketplace_sync(include_tools=True, session=requests_session)
 
@@ -227,25 +390,422 @@ class TestScanMarketplaceSync:
             assert len(result.errors) == 1
             assert "another-server" in result.errors[0] or "Failed" in result.errors[0]
 
-    def test_scan_empty_marketplace(self, requests_session: requests.Session) -> None:
+    def test_scan_forwards_user_agent_to_detail_pages(
+        self,
+        mock_api_response: dict,
+        mock_detail_page_without_tools: str,
+        requests_session: requests.Session,
+        api_mock: requests_mock.Adapter,
+    ) -> None:
+        """Test that detail page requests reuse the session's User-Agent."""
+        with respx.mock() as rx:
+            api_mock.register_uri("GET", MARKETPLACE_API_URL, json=mock_api_response)
+            rx.get(f"{MARKETPLACE_BASE_URL}/testpub/test-server").respond(text=mock_detail_page_without_tools)
+            rx.get(f"{MARKETPLACE_BASE_URL}/anotherpub/another-server").respond(text=mock_detail_page_without_tools)
+
+            scan_marketplace_sync(include_tools=True, session=requests_session)
+
+            assert len(rx.calls) == 2
+            for call in rx.calls:
+                assert call.request.headers["User-Agent"] == "TestCrawler/1.0"
+
+    def test_scan_forwards_session_cookies_to_detail_pages(
+        self,
+        mock_api_response: dict,
+        mock_detail_page_without_tools: str,
+        requests_session: requests.Session,
+        api_mock: requests_mock.Adapter,
+    ) -> None:
+        """Test that detail page requests carry the session's cookies."""
+        requests_session.cookies.set("consent", "yes", domain="www.dedaluslabs.ai")
+        with respx.mock() as rx:
+            api_mock.register_uri("GET", MARKETPLACE_API_URL, json=mock_api_response)
+            rx.get(url__startswith=MARKETPLACE_BASE_URL).respond(text=mock_detail_page_without_tools)
+
+            scan_marketplace_sync(include_tools=True, session=requests_session)
+
+            assert len(rx.calls) == 2
+            assert all(call.request.headers["Cookie"] == "consent=yes" for call in rx.calls)
+
+    def test_detail_client_options_follow_session_transport(self) -> None:
+        """Test that proxies, TLS verification and trust_env carry over to the detail page client."""
+        session = requests.Session()
+        session.proxies = {"https": "http://proxy.internal:3128"}
+        session.verify = False
+        session.trust_env = False
+
+        options = crawler._detail_client_options(session)
+
+        assert options["proxy"] == "http://proxy.internal:3128"
+        assert options["verify"].verify_mode == ssl.CERT_NONE
+        assert options["trust_env"] is False
+        assert "verify" not in crawler._detail_client_options(requests.Session())
+
+        session.verify = requests.certs.where()
+        assert crawler._detail_client_options(session)["verify"].verify_mode == ssl.CERT_REQUIRED
+
+    def test_scan_empty_marketplace(self, requests_session: requests.Session, api_mock: requests_mock.Adapter) -> None:
         """Test scanning an empty marketplace."""
-        with rm.Mocker() as m:
-            m.get(MARKETPLACE_API_URL, json={"repositories": []})
+        api_mock.register_uri("GET", MARKETPLACE_API_URL, json={"repositories": []})
 
-            result = scan_marketplace_sync(include_tools=False, session=requests_session)
+        result = scan_marketplace_sync(include_tools=False, session=requests_session)
 
-            assert result.total_servers == 0
-            assert len(result.servers) == 0
-            assert len(result.errors) == 0
+        assert result.total_servers == 0
+        assert len(result.servers) == 0
+        assert len(result.errors) == 0
 
-    def test_scan_creates_session_if_not_provided(self, mock_api_response: dict) -> None:
+    def test_scan_creates_session_if_not_provided(
+        self, mock_api_response: dict, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Test that a session is created if none is provided."""
-        with rm.Mocker() as m:
-            m.get(MARKETPLACE_API_URL, json=mock_api_response)
+        # Start from a fresh shared session so the mock adapter does not outlive the test
+        monkeypatch.setattr(crawler, "_SHARED_SESSION", None)
+        api_mock = requests_mock.Adapter()
+        crawler._get_shared_session().mount("https://", api_mock)
+        api_mock.register_uri("GET", MARKETPLACE_API_URL, json=mock_api_response)
+
+        result = scan_marketplace_sync(include_tools=False, session=None)
+
+        assert result.total_servers == 2
+        assert api_mock.last_request.headers["User-Agent"] == "DedalusMarketplaceCrawler/1.0"
+
+    def test_default_session_is_shared_and_retries(self) -> None:
+        """Test that the default session is reused and retries transient gateway errors."""
+        session = crawler._get_shared_session()
 
-            result = scan_marketplace_sync(include_tools=False, session=None)
+        assert crawler._get_shared_session() is session
+        retries = session.get_adapter(MARKETPLACE_API_URL).max_retries
+        assert retries.total == 2
+        assert 503 in retries.status_forcelist
+
+
+class TestScanMarketplaceAsync:
+    """Tests for scan_marketplace_async function."""
+
+    async def test_scan_async_with_tools(
+        self,
+        mock_api_response: dict,
+        mock_detail_page_with_tools: str,
+        mock_detail_page_without_tools: str,
+        requests_session: requests.Session,
+        api_mock: requests_mock.Adapter,
+    ) -> None:
+        """Test scanning with tools from inside a running event loop."""
+        api_mock.register_uri("GET", MARKETPLACE_API_URL, json=mock_api_response)
+
+        with respx.mock() as rx:
+            rx.get(f"{MARKETPLACE_BASE_URL}/testpub/test-server").respond(text=mock_detail_page_with_tools)
+            rx.get(f"{MARKETPLACE_BASE_URL}/anotherpub/another-server").respond(text=mock_detail_page_without_tools)
+
+            result = await scan_marketplace_async(include_tools=True, session=requests_session)
+
+        assert result.total_servers == 2
+        assert result.errors == []
+        assert [tool.name for tool in result.servers[0].tools] == ["test_tool_one", "test_tool_two"]
+        assert result.servers[1].tools == []
 
+    async def test_scan_sync_inside_running_loop(
+        self,
+        mock_api_response: dict,
+        mock_detail_page_with_tools: str,
+        mock_detail_page_without_tools: str,
+        requests_session: requests.Session,
+        api_mock: requests_mock.Adapter,
+    ) -> None:
+        """Test that the sync scan still fetches tools when called from a coroutine."""
+        api_mock.register_uri("GET", MARKETPLACE_API_URL, json=mock_api_response)
+
+        with respx.mock() as rx:
+            rx.get(f"{MARKETPLACE_BASE_URL}/testpub/test-server").respond(text=mock_detail_page_with_tools)
+            rx.get(f"{MARKETPLACE_BASE_URL}/anotherpub/another-server").respond(text=mock_detail_page_without_tools)
+
+            result = scan_marketplace_sync(include_tools=True, session=requests_session)
+
+        assert result.errors == []
+        assert [tool.name for tool in result.servers[0].tools] == ["test_tool_one", "test_tool_two"]
+
+    async def test_scan_async_handles_api_failure(
+        self, requests_session: requests.Session, api_mock: requests_mock.Adapter
+    ) -> None:
+        """Test that API failure is reported the same way as the sync scan."""
+        api_mock.register_uri("GET", MARKETPLACE_API_URL, status_code=500)
+
+        result = await scan_marketplace_async(include_tools=True, session=requests_session)
+
+        assert result.total_servers == 0
+        assert "Failed to fetch marketplace API" in result.errors[0]
+
+    async def test_scan_async_shares_cache_with_sync(
+        self, mock_api_response: dict, requests_session: requests.Session, api_mock: requests_mock.Adapter
+    ) -> None:
+        """Test that async scans reuse results cached by sync scans."""
+        api_mock.register_uri("GET", MARKETPLACE_API_URL, json=mock_api_response)
+
+        first = await asyncio.to_thread(scan_marketplace_sync, False, requests_session)
+        second = await scan_marketplace_async(include_tools=False, session=requests_session)
+
+        assert second == first
+        assert api_mock.call_count == 1
+
+
+class TestScanCache:
+    """Tests for the in-process scan result cache."""
+
+    def test_repeat_scan_is_served_from_cache(
+        self, mock_api_response: dict, requests_session: requests.Session, api_mock: requests_mock.Adapter
+    ) -> None:
+        """Test that a second scan within the TTL does not hit the API again."""
+        api_mock.register_uri("GET", MARKETPLACE_API_URL, json=mock_api_response)
+
+        first = scan_marketplace_sync(include_tools=False, session=requests_session)
+        second = scan_marketplace_sync(include_tools=False, session=requests_session)
+
+        assert api_mock.call_count == 1
+        assert second == first
+        assert second is not first
+
+    def test_cached_results_are_independent_copies(
+        self,
+        mock_api_response: dict,
+        mock_detail_page_with_tools: str,
+        mock_detail_page_without_tools: str,
+        requests_session: requests.Session,
+        api_mock: requests_mock.Adapter,
+    ) -> None:
+        """Test that changes a caller makes to its result do not leak into later cached results."""
+        with respx.mock() as rx:
+            api_mock.register_uri("GET", MARKETPLACE_API_URL, json=mock_api_response)
+            rx.get(f"{MARKETPLACE_BASE_URL}/testpub/test-server").respond(text=mock_detail_page_with_tools)
+            rx.get(f"{MARKETPLACE_BASE_URL}/anotherpub/another-server").respond(text=mock_detail_page_without_tools)
+
+            first = scan_marketplace_sync(include_tools=True, session=requests_session)
+            first.servers.reverse()
+            first.servers[1].tools.clear()
+            first.errors.append("caller note")
+
+            second = scan_marketplace_sync(include_tools=True, session=requests_session)
+            projected = scan_marketplace_sync(include_tools=False, session=requests_session)
+            projected.errors.append("caller note")
+
+        assert [server.name for server in second.servers] == ["test-server", "another-server"]
+        assert len(second.servers[0].tools) == 2
+        assert second.errors == []
+        assert scan_marketplace_sync(include_tools=True, session=requests_session).errors == []
+        assert api_mock.call_count == 1
+
+    def test_cache_is_scoped_to_session(
+        self, mock_api_response: dict, requests_session: requests.Session, api_mock: requests_mock.Adapter
+    ) -> None:
+        """Test that a scan through one session is not served to a caller using another."""
+        other_session = requests.Session()
+        other_mock = requests_mock.Adapter()
+        other_session.mount("https://", other_mock)
+        api_mock.register_uri("GET", MARKETPLACE_API_URL, json=mock_api_response)
+        other_mock.register_uri("GET", MARKETPLACE_API_URL, json={"repositories": []})
+
+        first = scan_marketplace_sync(include_tools=False, session=requests_session)
+        other = scan_marketplace_sync(include_tools=False, session=other_session)
+
+        assert first.total_servers == 2
+        assert other.total_servers == 0
+        assert other_mock.call_count == 1
+
+    def test_tools_scan_answers_scan_without_tools(
+        self,
+        mock_api_response: dict,
+        mock_detail_page_with_tools: str,
+        mock_detail_page_without_tools: str,
+        requests_session: requests.Session,
+        api_mock: requests_mock.Adapter,
+    ) -> None:
+        """Test that a cached include_tools scan is projected for include_tools=False."""
+        with respx.mock() as rx:
+            api_mock.register_uri("GET", MARKETPLACE_API_URL, json=mock_api_response)
+            rx.get(f"{MARKETPLACE_BASE_URL}/testpub/test-server").respond(text=mock_detail_page_with_tools)
+            rx.get(f"{MARKETPLACE_BASE_URL}/anotherpub/another-server").respond(text=mock_detail_page_without_tools)
+
+            full = scan_marketplace_sync(include_tools=True, session=requests_session)
+            result = scan_marketplace_sync(include_tools=False, session=requests_session)
+
+            assert api_mock.call_count == 1
             assert result.total_servers == 2
+            assert all(server.tools == [] for server in result.servers)
+            assert len(full.servers[0].tools) == 2
+
+    def test_failed_scan_is_not_cached(
+        self, mock_api_response: dict, requests_session: requests.Session, api_mock: requests_mock.Adapter
+    ) -> None:
+        """Test that a scan with errors is retried on the next call."""
+        api_mock.register_uri("GET", MARKETPLACE_API_URL, [{"status_code": 500}, {"json": mock_api_response}])
+
+        failed = scan_marketplace_sync(include_tools=False, session=requests_session)
+        result = scan_marketplace_sync(include_tools=False, session=requests_session)
+
+        assert len(failed.errors) == 1
+        assert result.total_servers == 2
+        assert api_mock.call_count == 2
+
+    def test_expired_cache_is_refreshed(
+        self,
+        mock_api_response: dict,
+        requests_session: requests.Session,
+        api_mock: requests_mock.Adapter,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that entries older than MARKETPLACE_CACHE_TTL are not reused."""
+        monkeypatch.setenv("MARKETPLACE_CACHE_TTL", "0")
+
+        api_mock.register_uri("GET", MARKETPLACE_API_URL, json=mock_api_response)
+
+        scan_marketplace_sync(include_tools=False, session=requests_session)
+        scan_marketplace_sync(include_tools=False, session=requests_session)
+
+        assert api_mock.call_count == 2
+
+    def test_invalid_cache_ttl_falls_back_to_default(
+        self,
+        mock_api_response: dict,
+        requests_session: requests.Session,
+        api_mock: requests_mock.Adapter,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that a malformed MARKETPLACE_CACHE_TTL keeps the default TTL instead of failing."""
+        monkeypatch.setenv("MARKETPLACE_CACHE_TTL", "one minute")
+
+        api_mock.register_uri("GET", MARKETPLACE_API_URL, json=mock_api_response)
+
+        scan_marketplace_sync(include_tools=False, session=requests_session)
+        scan_marketplace_sync(include_tools=False, session=requests_session)
+
+        assert api_mock.call_count == 1
+
+
+class TestDetailPageCaching:
+    """Tests for the parse cache and ETag/Last-Modified revalidation of detail pages."""
+
+    def test_identical_pages_are_parsed_once(
+        self, mock_api_response: dict, mock_detail_page_with_tools: str, mocker: MockerFixture
+    ) -> None:
+        """Test that servers sharing the same detail HTML are parsed once and across scans."""
+        servers = [crawler._parse_api_server(repo) for repo in mock_api_response["repositories"]]
+        spy = mocker.spy(crawler, "_parse_tools_from_html")
+
+        with respx.mock() as rx:
+            for server in servers:
+                rx.get(server.marketplace_url).respond(text=mock_detail_page_with_tools)
+
+            assert crawler._enrich_with_tools(requests.Session(), servers) == []
+            assert crawler._enrich_with_tools(requests.Session(), servers) == []
+
+        assert spy.call_count == 1
+        assert servers[0].tools == servers[1].tools
+        assert servers[0].tools is not servers[1].tools
+
+    def test_not_modified_reuses_cached_tools(
+        self, mock_detail_page_with_tools: str, requests_session: requests.Session, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a 304 response reuses the tools parsed from the previous fetch."""
+        # Expire cached pages immediately so the second pass revalidates
+        monkeypatch.setenv("MARKETPLACE_CACHE_TTL", "0")
+        url = f"{MARKETPLACE_BASE_URL}/testpub/test-server"
+        servers = [ServerInfo(name="test-server", slug="testpub/test-server", publisher="testpub", marketplace_url=url)]
+
+        with respx.mock() as rx:
+            route = rx.get(url).mock(
+                side_effect=[
+                    httpx.Response(200, text=mock_detail_page_with_tools, headers={"ETag": '"v1"'}),
+                    httpx.Response(304),
+                ]
+            )
+
+            assert crawler._enrich_with_tools(requests_session, servers) == []
+            servers[0].tools = []
+            assert crawler._enrich_with_tools(requests_session, servers) == []
+
+            assert route.calls[1].request.headers["If-None-Match"] == '"v1"'
+            assert [tool.name for tool in servers[0].tools] == ["test_tool_one", "test_tool_two"]
+
+    def test_recent_pages_are_reused_without_request(
+        self, mock_detail_page_with_tools: str, requests_session: requests.Session
+    ) -> None:
+        """Test that pages fetched within the cache TTL are not requested again."""
+        url = f"{MARKETPLACE_BASE_URL}/testpub/test-server"
+        servers = [ServerInfo(name="test-server", slug="testpub/test-server", publisher="testpub", marketplace_url=url)]
+
+        with respx.mock() as rx:
+            rx.get(url).respond(text=mock_detail_page_with_tools)
+
+            assert crawler._enrich_with_tools(requests_session, servers) == []
+            servers[0].tools = []
+            assert crawler._enrich_with_tools(requests_session, servers) == []
+
+            assert len(rx.calls) == 1
+            assert len(servers[0].tools) == 2
+
+    def test_cached_tools_cannot_be_edited_by_callers(
+        self, mock_detail_page_with_tools: str, requests_session: requests.Session
+    ) -> None:
+        """Test that tools shared through the caches reject edits, so later scans see the parsed values."""
+        url = f"{MARKETPLACE_BASE_URL}/testpub/test-server"
+        first = [ServerInfo(name="test-server", slug="testpub/test-server", publisher="testpub", marketplace_url=url)]
+        second = [server.model_copy() for server in first]
+
+        with respx.mock() as rx:
+            rx.get(url).respond(text=mock_detail_page_with_tools)
+
+            assert crawler._enrich_with_tools(requests_session, first) == []
+            with pytest.raises(dataclasses.FrozenInstanceError):
+                first[0].tools[0].description = "edited by caller"  # type: ignore[misc]
+            assert crawler._enrich_with_tools(requests.Session(), second) == []
+
+        assert second[0].tools[0].description == "First test tool description."
+
+
+class TestPrefetch:
+    """Tests for speculative detail page prefetching."""
+
+    def test_scan_without_tools_prefetches_popular_pages(
+        self,
+        mock_api_response: dict,
+        mock_detail_page_with_tools: str,
+        requests_session: requests.Session,
+        api_mock: requests_mock.Adapter,
+        mocker: MockerFixture,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that the hottest servers' pages are cached for the next tools scan."""
+        monkeypatch.setenv("PREFETCH_TOP_N", "1")
+        start_prefetch = mocker.spy(crawler, "_start_prefetch")
+        hot_url = f"{MARKETPLACE_BASE_URL}/testpub/test-server"
+        api_mock.register_uri("GET", MARKETPLACE_API_URL, json=mock_api_response)
+
+        with respx.mock() as rx:
+            rx.get(hot_url).respond(text=mock_detail_page_with_tools)
+
+            result = scan_marketplace_sync(include_tools=False, session=requests_session)
+            start_prefetch.spy_return.join(timeout=5)
+
+        assert list(crawler._DETAIL_CACHE) == [hot_url]
+        assert all(server.tools == [] for server in result.servers)
+
+        with respx.mock() as rx:
+            rx.get(f"{MARKETPLACE_BASE_URL}/anotherpub/another-server").respond(text="<html></html>")
+
+            full = scan_marketplace_sync(include_tools=True, session=requests_session)
+
+            # Only the page that was not prefetched is requested
+            assert len(rx.calls) == 1
+        assert [tool.name for tool in full.servers[0].tools] == ["test_tool_one", "test_tool_two"]
+
+    def test_prefetch_disabled_by_default(
+        self, mock_api_response: dict, requests_session: requests.Session, api_mock: requests_mock.Adapter
+    ) -> None:
+        """Test that no prefetch starts unless PREFETCH_TOP_N is set."""
+        api_mock.register_uri("GET", MARKETPLACE_API_URL, json=mock_api_response)
+
+        scan_marketplace_sync(include_tools=False, session=requests_session)
+
+        assert crawler._DETAIL_CACHE == {}
 
 
 class TestServerInfoModel:
@@ -276,6 +836,21 @@ class TestServerInfoModel:
         assert len(data["tools"]) == 1
         assert data["tools"][0]["name"] == "tool1"
 
+    def test_server_info_validates_tool_dicts(self) -> None:
+        """Test that tool dicts are validated into ToolInfo instances."""
+        server = ServerInfo.model_validate(
+            {
+                "name": "test",
+                "slug": "pub/test",
+                "publisher": "pub",
+                "marketplace_url": "https://example.com",
+                "tools": [{"name": "tool1"}],
+            }
+        )
+
+        assert server.tools == [ToolInfo(name="tool1", description=None)]
+        assert server.model_dump_json() == ServerInfo.model_validate_json(server.model_dump_json()).model_dump_json()
+
 
 class TestScanResultModel:
     """Tests for the ScanResult Pydantic model."""
@@ -9,65 +9,187 @@ These tests are designed to:
 3. Monitor API availability
 
 Run with: pytest tests/test_integration.py -v
+
+INTEGRATION_TEST selects the mode:
+- true: hit the live API on every run
+- refresh: hit the live API and record responses to the cassette
+- replay: serve responses from the recorded cassette, never touching the network
 """
 
 import os
-import sys
+import time
+from collections.abc import Callable, Iterator
 from pathlib import Path
+from typing import Any
 
+import ijson
+import orjson
 import pytest
+import requests
+import vcr
+from requests.adapters import HTTPAdapter
+
+from crawler import (
+    GITHUB_BASE_URL,
+    MARKETPLACE_API_URL,
+    MARKETPLACE_BASE_URL,
+    ScanResult,
+    ServerInfo,
+    scan_marketplace_sync,
+)
+
+INTEGRATION_MODE = os.environ.get("INTEGRATION_TEST", "")
+CASSETTE_PATH = Path(__file__).parent / "fixtures" / "marketplace_api.yaml"
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+_MP_PREFIX = MARKETPLACE_BASE_URL + "/"
+_GH_PREFIX = GITHUB_BASE_URL + "/"
 
-from crawler import GITHUB_BASE_URL, MARKETPLACE_API_URL, MARKETPLACE_BASE_URL, ScanResult, scan_marketplace_sync
+# Servers that should exist based on examples; update if they are removed from the marketplace
+KNOWN_SERVERS = frozenset({"windsor/ticketmaster-mcp", "windsor/open-meteo-mcp"})
+VALID_LANGUAGES = frozenset({"typescript", "python"})
+VALID_AUTH_TYPES = frozenset({"api_key", "oauth", "none"})
+
+# Optional ServerInfo fields and the values they may take when set
+FIELD_VALIDATORS: list[tuple[str, Callable[[Any], bool]]] = [
+    ("language", lambda v: v is None or v in VALID_LANGUAGES),
+    ("auth_required", lambda v: not v or v in VALID_AUTH_TYPES),
+    ("heat_score", lambda v: v is None or 0 <= v <= 100),
+    ("upvote_count", lambda v: v is None or v >= 0),
+]
+
+# Cassette record modes for the offline-capable modes; live mode uses no cassette
+_RECORD_MODES = {"replay": "none", "refresh": "all"}
 
 # Skip integration tests unless explicitly enabled
-pytestmark = pytest.mark.skipif(
-    os.environ.get("INTEGRATION_TEST") != "true", reason="Integration tests require INTEGRATION_TEST=true"
-)
+pytestmark = [
+    pytest.mark.skipif(
+        INTEGRATION_MODE not in {"true", *_RECORD_MODES},
+        reason="Integration tests require INTEGRATION_TEST=true, replay or refresh",
+    ),
+    pytest.mark.skipif(
+        INTEGRATION_MODE == "replay" and not CASSETTE_PATH.exists(),
+        reason="No recorded cassette; run once with INTEGRATION_TEST=refresh",
+    ),
+]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def require_api() -> None:
+    """Stop the module after one short health check if the live API is down.
+
+    Without it every test would wait out its own request timeout during an outage.
+    Live runs fail so outages are reported; refresh runs skip since there is
+    nothing to record.
+    """
+    if INTEGRATION_MODE == "replay":
+        return
+
+    stop = pytest.fail if INTEGRATION_MODE == "true" else pytest.skip
+    try:
+        response = requests.head(MARKETPLACE_API_URL, timeout=5, allow_redirects=True)
+    except requests.RequestException as e:
+        stop(f"API unreachable: {e}")
+    if response.status_code >= 500:
+        stop(f"API unhealthy: {response.status_code}")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def marketplace_cassette(require_api: None) -> Iterator[None]:
+    """Record or replay every HTTP request made by the integration tests.
+
+    Session scoped so the shared scan and API fixtures run inside the cassette.
+    Depends on the health check so that probe is never recorded.
+    """
+    record_mode = _RECORD_MODES.get(INTEGRATION_MODE)
+    if record_mode is None:
+        yield
+        return
+
+    with vcr.use_cassette(
+        str(CASSETTE_PATH),
+        record_mode=record_mode,
+        decode_compressed_response=True,
+        filter_headers=["cookie"],
+        allow_playback_repeats=True,
+    ):
+        yield
+
+
+@pytest.fixture(scope="session")
+def scan_result() -> ScanResult:
+    """Scan the live marketplace once and share the result across tests.
+
+    An empty marketplace fails every dependent test here, so tests need not recheck it.
+    """
+    result = scan_marketplace_sync(include_tools=False)
+    assert result.total_servers > 0, f"Marketplace scan returned no servers: {result.errors}"
+    return result
+
+
+@pytest.fixture(scope="session")
+def servers_with_github(scan_result: ScanResult) -> list[ServerInfo]:
+    """Servers from the shared scan that link a GitHub repository."""
+    return [s for s in scan_result.servers if s.github_url]
+
+
+@pytest.fixture(scope="session")
+def servers_with_language(scan_result: ScanResult) -> list[ServerInfo]:
+    """Servers from the shared scan that declare a language."""
+    return [s for s in scan_result.servers if s.language]
+
+
+@pytest.fixture(scope="session")
+def http_session() -> Iterator[requests.Session]:
+    """Provide one pooled HTTP session for direct API requests."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def api_response(http_session: requests.Session) -> requests.Response:
+    """Fetch the raw API response once."""
+    return http_session.get(MARKETPLACE_API_URL, timeout=30)
+
+
+@pytest.fixture(scope="session")
+def raw_payload(api_response: requests.Response) -> bytes:
+    """Keep the undecoded API body so each test parses only what it needs."""
+    return api_response.content
 
 
 class TestLiveMarketplaceAPI:
     """Integration tests against the live Dedalus Marketplace API."""
 
-    def test_api_returns_servers(self) -> None:
+    def test_api_returns_servers(self, scan_result: ScanResult) -> None:
         """Test that the API returns a non-empty list of servers."""
-        result = scan_marketplace_sync(include_tools=False)
+        result = scan_result
+        n = len(result.servers)
 
         assert isinstance(result, ScanResult)
-        assert result.total_servers > 0, "Expected at least one server in marketplace"
-        assert len(result.servers) == result.total_servers
+        assert n > 0 and n == result.total_servers, f"{n} servers listed but total_servers is {result.total_servers}"
 
-    def test_api_returns_no_errors(self) -> None:
+    def test_api_returns_no_errors(self, scan_result: ScanResult) -> None:
         """Test that the API scan completes without errors."""
-        result = scan_marketplace_sync(include_tools=False)
+        result = scan_result
 
         assert len(result.errors) == 0, f"Unexpected errors: {result.errors}"
 
-    def test_server_has_required_fields(self) -> None:
+    def test_server_has_required_fields(self, scan_result: ScanResult) -> None:
         """Test that servers have all required fields populated."""
-        result = scan_marketplace_sync(include_tools=False)
+        result = scan_result
 
-        assert result.total_servers > 0, "Need at least one server to test"
+        missing = [s for s in result.servers if not (s.name and s.slug and s.publisher and s.marketplace_url)]
+        assert not missing, f"{len(missing)} servers missing required fields, e.g. {missing[:5]}"
 
-        for server in result.servers:
-            # Required fields
-            assert server.name, f"Server missing name: {server}"
-            assert server.slug, f"Server missing slug: {server}"
-            assert server.publisher, f"Server missing publisher: {server}"
-            assert server.marketplace_url, f"Server missing marketplace_url: {server}"
+        # Validate URL formats
+        invalid = [s.marketplace_url for s in result.servers if not s.marketplace_url.startswith(_MP_PREFIX)]
+        assert not invalid, f"Invalid marketplace URLs: {invalid}"
 
-            # Validate URL formats
-            assert server.marketplace_url.startswith(MARKETPLACE_BASE_URL), (
-                f"Invalid marketplace URL: {server.marketplace_url}"
-            )
-
-    def test_servers_have_github_urls(self) -> None:
+    def test_servers_have_github_urls(self, scan_result: ScanResult, servers_with_github: list[ServerInfo]) -> None:
         """Test that most servers have GitHub URLs."""
-        result = scan_marketplace_sync(include_tools=False)
-
-        servers_with_github = [s for s in result.servers if s.github_url]
+        result = scan_result
 
         # Expect at least 50% of servers to have GitHub URLs
         min_expected = result.total_servers // 2
@@ -76,134 +198,91 @@ class TestLiveMarketplaceAPI:
         )
 
         # Validate GitHub URL format
-        for server in servers_with_github:
-            assert server.github_url.startswith(GITHUB_BASE_URL), f"Invalid GitHub URL format: {server.github_url}"
+        invalid = [s.github_url for s in servers_with_github if not s.github_url.startswith(_GH_PREFIX)]
+        assert not invalid, f"Invalid GitHub URL format: {invalid}"
 
-    def test_slug_format(self) -> None:
+    def test_slug_format(self, scan_result: ScanResult) -> None:
         """Test that server slugs have the expected publisher/name format."""
-        result = scan_marketplace_sync(include_tools=False)
+        result = scan_result
 
-        for server in result.servers:
-            # Slug should be in format "publisher/name"
-            assert "/" in server.slug, f"Slug missing separator: {server.slug}"
+        # Slug should be in format "publisher/name"
+        invalid = [s.slug for s in result.servers if s.slug.count("/") != 1]
+        assert not invalid, f"Invalid slug format: {invalid}"
 
-            parts = server.slug.split("/")
-            assert len(parts) == 2, f"Invalid slug format: {server.slug}"
-            assert parts[0] == server.publisher, f"Slug publisher mismatch: {server.slug} vs {server.publisher}"
+        mismatched = [(s.slug, s.publisher) for s in result.servers if s.slug.partition("/")[0] != s.publisher]
+        assert not mismatched, f"Slug publisher mismatch: {mismatched}"
 
-    def test_marketplace_url_matches_slug(self) -> None:
+    def test_marketplace_url_matches_slug(self, scan_result: ScanResult) -> None:
         """Test that marketplace URLs are correctly formed from slugs."""
-        result = scan_marketplace_sync(include_tools=False)
+        result = scan_result
 
-        for server in result.servers:
-            expected_url = f"{MARKETPLACE_BASE_URL}/{server.slug}"
-            assert server.marketplace_url == expected_url, f"URL mismatch: {server.marketplace_url} != {expected_url}"
+        mismatches = [
+            (s.marketplace_url, _MP_PREFIX + s.slug) for s in result.servers if s.marketplace_url != _MP_PREFIX + s.slug
+        ]
+        assert not mismatches, f"URL mismatch: {mismatches}"
 
-    def test_known_servers_exist(self) -> None:
+    def test_known_servers_exist(self, scan_result: ScanResult) -> None:
         """Test that some known servers are present in the marketplace."""
-        result = scan_marketplace_sync(include_tools=False)
-
-        slugs = {s.slug for s in result.servers}
+        result = scan_result
 
-        # These are servers that should exist based on examples
-        # Update this list if servers are removed from marketplace
-        known_servers = ["windsor/ticketmaster-mcp", "windsor/open-meteo-mcp"]
-
-        found = [s for s in known_servers if s in slugs]
-        assert len(found) > 0, (
+        found = next((s.slug for s in result.servers if s.slug in KNOWN_SERVERS), None)
+        assert found is not None, (
             f"Expected to find at least one known server. "
-            f"Known: {known_servers}, Found slugs sample: {list(slugs)[:10]}"
+            f"Known: {sorted(KNOWN_SERVERS)}, Found slugs sample: {[s.slug for s in result.servers[:10]]}"
         )
 
-    def test_language_field_values(self) -> None:
-        """Test that language field contains expected values."""
-        result = scan_marketplace_sync(include_tools=False)
-
-        servers_with_language = [s for s in result.servers if s.language]
+    def test_optional_fields_present(self, scan_result: ScanResult, servers_with_language: list[ServerInfo]) -> None:
+        """Test that optional metadata is populated for at least some servers."""
         assert len(servers_with_language) > 0, "Expected some servers with language"
+        assert any(s.heat_score is not None for s in scan_result.servers), "Expected some servers with heat scores"
 
-        valid_languages = {"typescript", "python"}
-        for server in servers_with_language:
-            assert server.language in valid_languages, f"Unexpected language '{server.language}' for {server.slug}"
+    def test_field_values(self, scan_result: ScanResult) -> None:
+        """Test language, auth, heat score and upvote values in a single pass over the servers."""
+        bad: dict[str, list[tuple[str, Any]]] = {}
+        for server in scan_result.servers:
+            for name, is_valid in FIELD_VALIDATORS:
+                value = getattr(server, name)
+                if not is_valid(value):
+                    bad.setdefault(name, []).append((server.slug, value))
 
-    def test_heat_score_range(self) -> None:
-        """Test that heat scores are within expected range."""
-        result = scan_marketplace_sync(include_tools=False)
-
-        servers_with_score = [s for s in result.servers if s.heat_score is not None]
-        assert len(servers_with_score) > 0, "Expected some servers with heat scores"
-
-        for server in servers_with_score:
-            assert 0 <= server.heat_score <= 100, f"Heat score out of range for {server.slug}: {server.heat_score}"
-
-    def test_upvote_count_non_negative(self) -> None:
-        """Test that upvote counts are non-negative."""
-        result = scan_marketplace_sync(include_tools=False)
-
-        for server in result.servers:
-            if server.upvote_count is not None:
-                assert server.upvote_count >= 0, f"Negative upvotes for {server.slug}: {server.upvote_count}"
-
-    def test_auth_field_values(self) -> None:
-        """Test that auth_required field contains expected values."""
-        result = scan_marketplace_sync(include_tools=False)
-
-        servers_with_auth = [s for s in result.servers if s.auth_required]
-        # Not all servers may have auth info, so just validate those that do
-
-        valid_auth_types = {"api_key", "oauth", "none"}
-        for server in servers_with_auth:
-            assert server.auth_required in valid_auth_types, (
-                f"Unexpected auth type '{server.auth_required}' for {server.slug}"
-            )
+        assert not bad, f"Unexpected field values: {bad}"
 
 
 class TestAPIStability:
     """Tests to detect API changes that could break the crawler."""
 
-    def test_api_endpoint_accessible(self) -> None:
+    def test_api_endpoint_accessible(self, api_response: requests.Response) -> None:
         """Test that the API endpoint is accessible."""
-        import requests
-
-        response = requests.get(MARKETPLACE_API_URL, timeout=30)
-        assert response.status_code == 200, f"API returned status {response.status_code}"
+        assert api_response.status_code == 200, f"API returned status {api_response.status_code}"
 
-    def test_api_returns_json(self) -> None:
+    def test_api_returns_json(self, raw_payload: bytes) -> None:
         """Test that the API returns valid JSON."""
-        import requests
-
-        response = requests.get(MARKETPLACE_API_URL, timeout=30)
-        data = response.json()
+        data = orjson.loads(raw_payload)
 
         assert isinstance(data, dict), "Expected JSON object"
         assert "repositories" in data, "Missing 'repositories' key in response"
 
-    def test_repository_schema(self) -> None:
+    def test_repository_schema(self, raw_payload: bytes) -> None:
         """Test that repository objects have expected schema."""
-        import requests
+        # Stop after the first repository instead of parsing the whole payload
+        repo = next(ijson.items(raw_payload, "repositories.item"), None)
 
-        response = requests.get(MARKETPLACE_API_URL, timeout=30)
-        data = response.json()
-
-        repos = data.get("repositories", [])
-        assert len(repos) > 0, "No repositories in response"
+        assert repo is not None, "No repositories in response"
 
         # Check first repo has expected fields
-        repo = repos[0]
         expected_fields = ["slug", "git_slug", "description", "visibility"]
 
-        for field in expected_fields:
-            assert field in repo, f"Missing field '{field}' in repository schema"
+        missing = [field for field in expected_fields if field not in repo]
+        assert not missing, f"Missing fields {missing} in repository schema"
 
-    def test_response_time(self) -> None:
+    def test_response_time(self, http_session: requests.Session) -> None:
         """Test that API responds within acceptable time."""
-        import time
-
-        import requests
+        # Warm up the pooled connection so TLS setup is not counted as server latency
+        http_session.get(MARKETPLACE_API_URL, timeout=30)
 
-        start = time.time()
-        response = requests.get(MARKETPLACE_API_URL, timeout=30)
-        elapsed = time.time() - start
+        start = time.perf_counter()
+        response = http_session.get(MARKETPLACE_API_URL, timeout=30)
+        elapsed = time.perf_counter() - start
 
         assert response.status_code == 200
         assert elapsed < 10, f"API response too slow: {elapsed:.2f}s"